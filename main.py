@@ -16,14 +16,22 @@ import json
 # Add src directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from vintage_analyzer import VintageAnalyzer
+
+class ArgumentFileParser(argparse.ArgumentParser):
+    """Argument parser that reads whitespace-separated arguments from @files."""
+    
+    def convert_arg_line_to_args(self, arg_line: str) -> List[str]:
+        """Split each line of an argument file on whitespace."""
+        return arg_line.split()
 
 
 def parse_arguments() -> argparse.Namespace:
     """Parse command line arguments."""
-    parser = argparse.ArgumentParser(
+    parser = ArgumentFileParser(
         description="Consumer Credit Vintage Analysis Tool",
-        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+        epilog="Arguments can also be read from a file by passing @path/to/args.txt",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        fromfile_prefix_chars='@'
     )
     
     # Required arguments
@@ -81,7 +89,15 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument(
         '--export-results', 
         action='store_true',
-        help='Export analysis results to CSV files'
+        help='Export analysis results to files'
+    )
+    
+    parser.add_argument(
+        '--export-format', 
+        type=str, 
+        choices=['csv', 'parquet'], 
+        default='csv',
+        help='File format for exported results'
     )
     
     parser.add_argument(
@@ -230,6 +246,9 @@ def main():
     if not create_output_directory(args.output_dir):
         sys.exit(1)
     
+    # Deferred so --help and invalid invocations exit before pandas is loaded
+    from vintage_analyzer import VintageAnalyzer
+    
     # Load configuration
     config = load_config(args.config_file)
     
@@ -269,7 +288,10 @@ def main():
         # Export results if requested
         if args.export_results:
             print(f"\n💾 Exporting results to {args.output_dir}...")
-            analyzer.export_results(args.output_dir)
+            if args.export_format == 'parquet':
+                analyzer.export_parquet(args.output_dir)
+            else:
+                analyzer.export_results(args.output_dir)
         
         # Print summary statistics
         stats = analyzer.get_summary_statistics()
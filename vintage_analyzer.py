@@ -6,13 +6,38 @@ It tracks cumulative overdue performance across different booking cohorts and vi
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from numba import njit, prange
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+from typing import Dict, Iterator, List, Tuple, Optional
 from datetime import datetime
 import warnings
 
-warnings.filterwarnings('ignore')
+
+@njit(cache=True, boundscheck=False, parallel=True)
+def _ever_bad_scan(overdue: np.ndarray, offsets: np.ndarray, out: np.ndarray) -> None:
+    """
+    Ever-bad scan over rows sorted by customer and vintage month.
+    
+    Customers occupy contiguous row ranges, so each range is scanned
+    independently and the ranges are distributed across threads.
+    
+    Args:
+        overdue (np.ndarray): Overdue days for each row
+        offsets (np.ndarray): Start row of each customer, followed by the row count
+        out (np.ndarray): Output buffer receiving the ever-bad cumulative
+    """
+    for g in prange(offsets.size - 1):
+        cumulative = 0
+        started = False
+        for i in range(offsets[g], offsets[g + 1]):
+            if overdue[i] > 0:
+                started = True
+            if started:
+                cumulative += overdue[i]
+            out[i] = cumulative
 
 
 class VintageAnalyzer:
@@ -23,6 +48,10 @@ class VintageAnalyzer:
     tracking cumulative overdue days across different booking cohorts.
     """
     
+    CREDIT_COLUMNS = ['ID', 'Month', 'Overdue_Days']
+    CREDIT_DTYPES = {'ID': 'int64', 'Month': 'string', 'Overdue_Days': 'int32'}
+    CREDIT_CHUNK_SIZE = 500_000
+    
     def __init__(self, config: Optional[Dict] = None):
         """
         Initialize the VintageAnalyzer.
@@ -32,10 +61,13 @@ class VintageAnalyzer:
         """
         self.config = config or self._default_config()
         self.credit_df = None
+        self._credit_file = None
         self.book_df = None
         self.merged_df = None
+        self._id_codes = None
+        self._id_uniques = None
+        self._book_month_codes = None
         self.vintage_table = None
-        self.vintage_filled = None
         
     def _default_config(self) -> Dict:
         """Default configuration settings."""
@@ -58,20 +90,50 @@ class VintageAnalyzer:
         """
         Load credit report and book month data from CSV files.
         
+        The book month data (one row per customer) is read into memory. The
+        credit report is only validated here and is streamed in chunks by
+        preprocess_data() to bound peak memory.
+        
         Args:
             credit_file (str): Path to consumer credit report CSV
             book_file (str): Path to consumer book month CSV
         """
         try:
-            self.credit_df = pd.read_csv(credit_file)
-            self.book_df = pd.read_csv(book_file)
-            print(f"✓ Loaded credit data: {len(self.credit_df)} records")
+            # Read only the header to fail early on missing files or columns
+            pd.read_csv(credit_file, usecols=self.CREDIT_COLUMNS, nrows=0)
+            self.credit_df = None
+            self._credit_file = credit_file
+            self.book_df = pd.read_csv(
+                book_file,
+                engine='pyarrow',
+                usecols=['ID', 'Book_Month'],
+                dtype={'ID': 'int64', 'Book_Month': 'string'}
+            )
+            print(f"✓ Found credit data: {credit_file}")
             print(f"✓ Loaded book data: {len(self.book_df)} records")
         except FileNotFoundError as e:
             raise FileNotFoundError(f"Data file not found: {e}")
         except Exception as e:
             raise Exception(f"Error loading data: {e}")
     
+    def _iter_credit_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Yield the credit report in chunks.
+        
+        A credit_df assigned in memory is yielded as a single chunk; otherwise
+        the file given to load_data() is streamed CREDIT_CHUNK_SIZE rows at a time.
+        """
+        if self.credit_df is not None:
+            yield self.credit_df
+            return
+        
+        yield from pd.read_csv(
+            self._credit_file,
+            usecols=self.CREDIT_COLUMNS,
+            dtype=self.CREDIT_DTYPES,
+            chunksize=self.CREDIT_CHUNK_SIZE
+        )
+    
     def preprocess_data(self) -> None:
         """
         Merge and preprocess the credit and book month data.
@@ -83,15 +145,23 @@ class VintageAnalyzer:
         4. Filters valid records
         5. Sorts data appropriately
         """
-        if self.credit_df is None or self.book_df is None:
+        if (self.credit_df is None and self._credit_file is None) or self.book_df is None:
             raise ValueError("Data not loaded. Call load_data() first.")
         
-        # Merge book month into credit data
-        self.merged_df = self.credit_df.merge(
-            self.book_df[['ID', 'Book_Month']], 
-            on='ID', 
-            how='inner'
-        )
+        # Merge book month into each credit chunk so only merged rows are kept
+        book_months = self.book_df[['ID', 'Book_Month']]
+        n_credit = 0
+        merged_chunks = []
+        try:
+            for chunk in self._iter_credit_chunks():
+                n_credit += len(chunk)
+                merged_chunks.append(chunk.merge(book_months, on='ID', how='inner'))
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Data file not found: {e}")
+        except Exception as e:
+            raise Exception(f"Error loading data: {e}")
+        self.merged_df = pd.concat(merged_chunks, ignore_index=True)
+        print(f"✓ Loaded credit data: {n_credit} records")
         
         # Convert months to datetime
         self.merged_df['Month'] = pd.to_datetime(
@@ -104,45 +174,58 @@ class VintageAnalyzer:
         )
         
         # Calculate vintage month
-        self.merged_df['Vintage_Month'] = (
-            (self.merged_df['Month'].dt.year - self.merged_df['Book_Month'].dt.year) * 12 +
-            (self.merged_df['Month'].dt.month - self.merged_df['Book_Month'].dt.month)
-        )
+        month = self.merged_df['Month'].to_numpy().astype('datetime64[M]')
+        book_month = self.merged_df['Book_Month'].to_numpy().astype('datetime64[M]')
+        self.merged_df['Vintage_Month'] = (month - book_month).astype('int64')
         
         # Filter valid records and sort
         self.merged_df = self.merged_df[self.merged_df['Vintage_Month'] >= 0]
         self.merged_df = self.merged_df.sort_values(by=['ID', 'Vintage_Month'])
         
+        # Vintage months and overdue days fit comfortably in 32 bits
+        self.merged_df = self.merged_df.astype({'Vintage_Month': 'int32', 'Overdue_Days': 'int32'})
+        
+        # Book months are few, so store them as ordered categorical codes
+        self.merged_df['Book_Month'] = self.merged_df['Book_Month'].astype(
+            pd.CategoricalDtype(ordered=True)
+        )
+        self._book_month_codes = {
+            book_month: code
+            for code, book_month in enumerate(self.merged_df['Book_Month'].cat.categories)
+        }
+        
+        # Factorize IDs once so downstream per-customer passes reuse the codes
+        self._id_codes, self._id_uniques = pd.factorize(self.merged_df['ID'].to_numpy(), sort=False)
+        
         print(f"✓ Preprocessed data: {len(self.merged_df)} valid records")
         print(f"✓ Vintage month range: {self.merged_df['Vintage_Month'].min()}-{self.merged_df['Vintage_Month'].max()}")
     
-    def compute_ever_bad(self, group: pd.DataFrame) -> pd.DataFrame:
+    def calculate_ever_bad_metrics(self) -> None:
         """
         Compute ever-bad logic: cumulative overdue after first overdue occurrence.
         
-        Args:
-            group (pd.DataFrame): Customer group data
-            
-        Returns:
-            pd.DataFrame: Group with Ever_Bad column added
+        Relies on merged_df being sorted by ID and Vintage_Month, which
+        preprocess_data() guarantees.
         """
-        cumulative = 0
-        ever_bad_list = []
-        
-        for overdue in group['Overdue_Days']:
-            if overdue > 0 or cumulative > 0:
-                cumulative += overdue
-            ever_bad_list.append(cumulative)
-        
-        group['Ever_Bad'] = ever_bad_list
-        return group
-    
-    def calculate_ever_bad_metrics(self) -> None:
-        """Apply ever-bad calculation across all customer groups."""
         if self.merged_df is None:
             raise ValueError("Data not preprocessed. Call preprocess_data() first.")
         
-        self.merged_df = self.merged_df.groupby('ID').apply(self.compute_ever_bad)
+        overdue = self.merged_df['Overdue_Days'].to_numpy()
+        ever_bad = np.empty(len(overdue), dtype=np.int64)
+        
+        # Row offsets of each customer's contiguous block
+        offsets = np.concatenate((
+            [0],
+            np.flatnonzero(np.diff(self._id_codes)) + 1,
+            [len(overdue)]
+        )).astype(np.int64)
+        _ever_bad_scan(overdue, offsets, ever_bad)
+        
+        # Downcast unless some customer's cumulative overdue exceeds int32
+        if ever_bad.size and ever_bad.max() > np.iinfo(np.int32).max:
+            self.merged_df['Ever_Bad'] = ever_bad
+        else:
+            self.merged_df['Ever_Bad'] = ever_bad.astype(np.int32)
         print("✓ Ever-bad metrics calculated")
     
     def create_vintage_table(self) -> None:
@@ -150,18 +233,43 @@ class VintageAnalyzer:
         if self.merged_df is None:
             raise ValueError("Ever-bad metrics not calculated.")
         
-        self.vintage_table = self.merged_df.pivot_table(
-            index='Book_Month',
-            columns='Vintage_Month',
-            values='Ever_Bad',
-            aggfunc='sum'
+        # Sum in int64 so cohort totals of int32 Ever_Bad values cannot overflow
+        self.vintage_table = (
+            self.merged_df['Ever_Bad']
+            .astype(np.int64)
+            .groupby([self.merged_df['Book_Month'], self.merged_df['Vintage_Month']], sort=True, observed=True)
+            .sum()
+            .unstack('Vintage_Month')
         )
         
-        # Fill missing values with forward fill
-        self.vintage_filled = self.vintage_table.copy().ffill(axis=1)
-        
         print(f"✓ Vintage table created: {self.vintage_table.shape}")
     
+    @property
+    def vintage_filled(self) -> Optional[pd.DataFrame]:
+        """
+        Vintage table forward-filled along each cohort row, computed on access.
+        
+        Returns:
+            pd.DataFrame: Filled vintage table, or None if not yet created
+        """
+        if self.vintage_table is None:
+            return None
+        
+        values = self.vintage_table.to_numpy(dtype=np.float64)
+        
+        # Without holes there is nothing to fill; keep the pivot's dtype
+        if not np.isnan(values).any():
+            return self.vintage_table.copy()
+        
+        # Carry the column position of the last observed value forward
+        last_valid = np.where(np.isnan(values), 0, np.arange(values.shape[1]))
+        np.maximum.accumulate(last_valid, axis=1, out=last_valid)
+        return pd.DataFrame(
+            np.take_along_axis(values, last_valid, axis=1),
+            index=self.vintage_table.index,
+            columns=self.vintage_table.columns
+        )
+    
     def calculate_quarterly_performance(self, quarter_months: List[str]) -> pd.Series:
         """
         Calculate performance for specified quarter months.
@@ -172,16 +280,33 @@ class VintageAnalyzer:
         Returns:
             pd.Series: Quarterly performance by vintage month
         """
-        if self.vintage_filled is None:
-            raise ValueError("Vintage table not created. Call create_vintage_table() first.")
-        
-        quarter_timestamps = [pd.Timestamp(month) for month in quarter_months]
-        available_months = [month for month in quarter_timestamps if month in self.vintage_filled.index]
-        
-        if not available_months:
+        if self.merged_df is None or 'Ever_Bad' not in self.merged_df.columns:
+            raise ValueError("Ever-bad metrics not calculated. Call calculate_ever_bad_metrics() first.")
+        
+        quarter_codes = [
+            self._book_month_codes[pd.Timestamp(month)]
+            for month in quarter_months
+            if pd.Timestamp(month) in self._book_month_codes
+        ]
+        quarter_df = self.merged_df.loc[
+            np.isin(self.merged_df['Book_Month'].cat.codes.to_numpy(), quarter_codes)
+        ]
+        
+        if quarter_df.empty:
             raise ValueError(f"No data available for specified quarter months: {quarter_months}")
         
-        return self.vintage_filled.loc[available_months].sum(axis=0)
+        # Aggregate only the selected cohorts instead of the full vintage table,
+        # spanning every portfolio vintage month so values carry forward
+        vintage_months = np.sort(self.merged_df['Vintage_Month'].unique())
+        quarter_table = (
+            quarter_df['Ever_Bad']
+            .astype(np.int64)
+            .groupby([quarter_df['Book_Month'], quarter_df['Vintage_Month']], sort=True, observed=True)
+            .sum()
+            .unstack('Vintage_Month')
+            .reindex(columns=vintage_months)
+        )
+        return quarter_table.ffill(axis=1).sum(axis=0)
     
     def plot_quarterly_performance(self, quarter_months: Optional[List[str]] = None) -> None:
         """
@@ -190,6 +315,8 @@ class VintageAnalyzer:
         Args:
             quarter_months (List[str], optional): Quarter months to analyze
         """
+        import matplotlib.pyplot as plt
+        
         if quarter_months is None:
             quarter_months = self.config['q1_months']
         
@@ -224,35 +351,53 @@ class VintageAnalyzer:
         plt.legend(title='Analysis Type')
         plt.grid(True, alpha=0.3)
         plt.tight_layout()
-        plt.show()
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=UserWarning)
+            plt.show()
     
     def plot_monthly_cohorts(self) -> None:
         """Plot individual performance curves for each booking month cohort."""
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import LineCollection
+        from matplotlib.lines import Line2D
+        
         if self.vintage_table is None:
             raise ValueError("Vintage table not created. Call create_vintage_table() first.")
         
-        plt.figure(figsize=self.config['figure_size'])
+        _, ax = plt.subplots(figsize=self.config['figure_size'])
+        
+        n_cohorts = len(self.vintage_table.index)
+        colors = plt.cm.tab10(np.linspace(0, 1, n_cohorts))
+        vintage_months = self.vintage_table.columns.to_numpy(dtype=np.float64)
+        values = self.vintage_table.to_numpy(dtype=np.float64)
+        
+        # Draw every cohort curve with a single collection plus one marker scatter
+        segments = [np.column_stack((vintage_months, row)) for row in values]
+        ax.add_collection(LineCollection(segments, colors=colors, linewidths=1.5))
+        ax.scatter(
+            np.tile(vintage_months, n_cohorts), 
+            values.ravel(), 
+            c=np.repeat(colors, len(vintage_months), axis=0), 
+            marker='o', 
+            s=16
+        )
+        ax.autoscale()
         
-        colors = plt.cm.tab10(np.linspace(0, 1, len(self.vintage_table.index)))
-        
-        for i, book_month in enumerate(self.vintage_table.index):
-            plt.plot(
-                self.vintage_table.columns, 
-                self.vintage_table.loc[book_month], 
-                marker='o', 
-                color=colors[i],
-                label=book_month.strftime('%b %Y'),
-                linewidth=1.5,
-                markersize=4
-            )
+        legend_handles = [
+            Line2D([], [], color=colors[i], marker='o', linewidth=1.5, markersize=4,
+                   label=book_month.strftime('%b %Y'))
+            for i, book_month in enumerate(self.vintage_table.index)
+        ]
         
         plt.title('Vintage Analysis - Monthly Cohort Performance', fontsize=14, fontweight='bold')
         plt.xlabel('Vintage Month', fontsize=12)
         plt.ylabel('Cumulative Overdue Days', fontsize=12)
-        plt.legend(title='Book Month', bbox_to_anchor=(1.05, 1), loc='upper left')
+        plt.legend(handles=legend_handles, title='Book Month', bbox_to_anchor=(1.05, 1), loc='upper left')
         plt.grid(True, alpha=0.3)
         plt.tight_layout()
-        plt.show()
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=UserWarning)
+            plt.show()
     
     def run_full_analysis(self, credit_file: str, book_file: str) -> None:
         """
@@ -287,24 +432,84 @@ class VintageAnalyzer:
         if self.merged_df is None:
             raise ValueError("Analysis not completed. Run analysis first.")
         
+        # One pass for the global aggregates and one for the per-customer totals
+        totals = self.merged_df.agg({
+            'Vintage_Month': ['min', 'max'],
+            'Book_Month': ['min', 'max'],
+            'Overdue_Days': 'sum',
+            'Ever_Bad': 'sum'
+        })
+        overdue_per_id = self.merged_df.groupby(self._id_codes, sort=False)['Overdue_Days'].sum()
+        
         stats = {
-            'total_customers': self.merged_df['ID'].nunique(),
+            'total_customers': int(overdue_per_id.size),
             'total_records': len(self.merged_df),
             'vintage_month_range': {
-                'min': int(self.merged_df['Vintage_Month'].min()),
-                'max': int(self.merged_df['Vintage_Month'].max())
+                'min': int(totals.at['min', 'Vintage_Month']),
+                'max': int(totals.at['max', 'Vintage_Month'])
             },
             'book_month_range': {
-                'earliest': self.merged_df['Book_Month'].min().strftime('%b %Y'),
-                'latest': self.merged_df['Book_Month'].max().strftime('%b %Y')
+                'earliest': totals.at['min', 'Book_Month'].strftime('%b %Y'),
+                'latest': totals.at['max', 'Book_Month'].strftime('%b %Y')
             },
-            'total_overdue_days': int(self.merged_df['Overdue_Days'].sum()),
-            'total_ever_bad_days': int(self.merged_df['Ever_Bad'].sum()),
-            'customers_with_overdue': int((self.merged_df.groupby('ID')['Overdue_Days'].sum() > 0).sum())
+            'total_overdue_days': int(totals.at['sum', 'Overdue_Days']),
+            'total_ever_bad_days': int(totals.at['sum', 'Ever_Bad']),
+            'customers_with_overdue': int((overdue_per_id > 0).sum())
         }
         
         return stats
     
+    @staticmethod
+    def _write_csv(df: pd.DataFrame, path: str) -> None:
+        """
+        Write a DataFrame to CSV using Arrow's multithreaded writer.
+        
+        The output keeps the layout DataFrame.to_csv produced: an unquoted
+        header, month-start timestamps written as plain dates and whole-number
+        floats written with a trailing '.0'.
+        
+        Args:
+            df (pd.DataFrame): Data to write, without a meaningful index
+            path (str): Destination CSV path
+        """
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        for i, field in enumerate(table.schema):
+            column = table.column(i)
+            if pa.types.is_dictionary(field.type):
+                column = column.cast(field.type.value_type)
+            if pa.types.is_timestamp(column.type):
+                column = column.cast(pa.date32())
+            elif pa.types.is_floating(column.type):
+                column = VintageAnalyzer._format_floats(column)
+            table = table.set_column(i, field.name, column)
+        
+        with open(path, 'wb') as f:
+            f.write((','.join(table.column_names) + '\n').encode('utf-8'))
+            pacsv.write_csv(
+                table, f, pacsv.WriteOptions(include_header=False, quoting_style='none')
+            )
+    
+    @staticmethod
+    def _format_floats(column: pa.ChunkedArray) -> pa.ChunkedArray:
+        """
+        Format a float column the way pandas writes floats to CSV.
+        
+        Args:
+            column (pa.ChunkedArray): Float values, nulls written as empty cells
+            
+        Returns:
+            pa.ChunkedArray: String values, e.g. '1610.0' and '0.5'
+        """
+        # Below 1e16 a whole-number float's repr is its integer digits plus '.0'
+        whole = pc.and_(
+            pc.equal(pc.floor(column), column),
+            pc.less(pc.abs(column), 1e16)
+        )
+        whole_text = pc.binary_join_element_wise(
+            pc.cast(pc.if_else(whole, column, 0.0), pa.int64()).cast(pa.string()), '.0', ''
+        )
+        return pc.if_else(whole, whole_text, pc.cast(column, pa.string()))
+    
     def export_results(self, output_dir: str = './output/') -> None:
         """
         Export analysis results to CSV files.
@@ -319,18 +524,53 @@ class VintageAnalyzer:
         
         # Export vintage table
         if self.vintage_table is not None:
-            self.vintage_table.to_csv(f"{output_dir}/vintage_table.csv")
+            self._write_csv(self.vintage_table.reset_index(), f"{output_dir}/vintage_table.csv")
             print(f"✓ Vintage table exported to {output_dir}/vintage_table.csv")
         
         # Export filled vintage table
-        if self.vintage_filled is not None:
-            self.vintage_filled.to_csv(f"{output_dir}/vintage_table_filled.csv")
+        vintage_filled = self.vintage_filled
+        if vintage_filled is not None:
+            self._write_csv(vintage_filled.reset_index(), f"{output_dir}/vintage_table_filled.csv")
             print(f"✓ Filled vintage table exported to {output_dir}/vintage_table_filled.csv")
         
         # Export processed data
         if self.merged_df is not None:
-            self.merged_df.to_csv(f"{output_dir}/processed_data.csv", index=False)
+            self._write_csv(self.merged_df, f"{output_dir}/processed_data.csv")
             print(f"✓ Processed data exported to {output_dir}/processed_data.csv")
+    
+    def export_parquet(self, output_dir: str = './output/') -> None:
+        """
+        Export analysis results to zstd-compressed Parquet files.
+        
+        Args:
+            output_dir (str): Directory to save output files
+        """
+        import os
+        
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        
+        # Export vintage table (Parquet requires string column names)
+        if self.vintage_table is not None:
+            self.vintage_table.rename(columns=str).to_parquet(
+                f"{output_dir}/vintage_table.parquet", engine='pyarrow', compression='zstd'
+            )
+            print(f"✓ Vintage table exported to {output_dir}/vintage_table.parquet")
+        
+        # Export filled vintage table
+        vintage_filled = self.vintage_filled
+        if vintage_filled is not None:
+            vintage_filled.rename(columns=str).to_parquet(
+                f"{output_dir}/vintage_table_filled.parquet", engine='pyarrow', compression='zstd'
+            )
+            print(f"✓ Filled vintage table exported to {output_dir}/vintage_table_filled.parquet")
+        
+        # Export processed data
+        if self.merged_df is not None:
+            self.merged_df.to_parquet(
+                f"{output_dir}/processed_data.parquet", engine='pyarrow', compression='zstd', index=False
+            )
+            print(f"✓ Processed data exported to {output_dir}/processed_data.parquet")
 
 
 if __name__ == "__main__":